@@ -12,40 +12,132 @@ website.
 from __future__ import annotations
 
 import argparse
+import asyncio
 import dataclasses
 import datetime as dt
+import gzip
+import re
+import shelve
 import sys
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import IO, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 import requests
-
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import requests_cache
+except ImportError:  # pragma: no cover - caching is optional
+    requests_cache = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - fall back to the stdlib decoder
+    from json import loads as _json_loads
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - streaming parsing is optional
+    ijson = None
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - the asyncio fetcher is optional
+    aiohttp = None
+
+# Performance note: run time is dominated by network round-trips and JSON
+# decoding, and the remaining work is string/dict handling. There are no
+# numeric inner loops, so JIT compilers such as Numba (or Cython rewrites) are
+# a poor fit here and would fall back to object mode. Keep _extract_min_price,
+# _parse_travel_minutes and build_table as plain Python; speed-ups belong in
+# the I/O layer (pooled session, concurrency, caching, orjson).
 BASE_URL = "https://pass.rzd.ru/timetable/public/ru"
-ALLOWED_FARE_NAMES = {
+ALLOWED_FARE_NAMES = frozenset({
     "эконом",
     "эконом+",
     "базовый",
     "вагон-бистро",
-}
+})
+# Car fields that may carry the fare class name, depending on the response.
+_FARE_KEYS = ("service", "type", "tariffType", "typeLoc", "category")
 MOSCOW_CODE = "2000000"
 SAINT_P_CODE = "2004000"
 MAX_TRAVEL_MINUTES = 4 * 60 + 30
 DATE_FORMAT = "%d.%m.%Y"
-
-
-@dataclasses.dataclass
+SAPSAN_MIN_NUMBER = 700
+_DIGITS_RE = re.compile(r"\d+")
+# Indexed by date.weekday(); avoids locale-dependent strftime("%A"). main and
+# _WEEKDAY_ORDER both take their keys from this tuple, so build_table looks up
+# the very same string objects that quotes are stored under.
+_WEEKDAYS_EN = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MAX_WORKERS = 8
+MAX_ASYNC_CONNECTIONS = 16
+REQUEST_TIMEOUT = 30
+CACHE_NAME = "sapsan_cache"
+DEFAULT_CACHE_TTL = 3600
+VALIDATORS_NAME = "sapsan_validators"
+# Bump when the stored entry layout changes; older entries are then ignored.
+VALIDATORS_VERSION = 1
+_VALIDATORS_LOCK = threading.Lock()
+
+# RZD sporadically answers 5xx under load; retry those with backoff. The last
+# response is returned rather than raised so that raise_for_status() reports it.
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+    raise_on_status=False,
+)
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class FareQuote:
     departure: dt.datetime
-    weekday: str
     price: float
 
 
+def _get_session() -> requests.Session:
+    """Return the shared session, creating it on first use.
+
+    Concurrent day fetches reuse its pooled keep-alive connections instead of
+    paying a TCP/TLS handshake per request. When requests-cache is installed,
+    responses are also persisted to SQLite so that repeated runs over the same
+    dates skip the network. The session is built lazily so that --help and
+    --async never create the cache file.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            if requests_cache is not None:
+                session = requests_cache.CachedSession(
+                    CACHE_NAME, backend="sqlite", expire_after=DEFAULT_CACHE_TTL
+                )
+            else:
+                session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(max_retries=RETRY, pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS),
+            )
+            _SESSION = session
+        return _SESSION
+
+
+def _parse_cli_date(value: str) -> dt.date:
+    return dt.datetime.strptime(value, DATE_FORMAT).date()
+
+
 def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
         "--start-date",
-        type=lambda s: dt.datetime.strptime(s, DATE_FORMAT).date(),
+        type=_parse_cli_date,
         default=dt.date.today(),
         help="Start date (inclusive) in DD.MM.YYYY format. Defaults to today.",
     )
@@ -55,21 +147,171 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         default=7,
         help="Number of days to fetch (starting from start-date). Defaults to 7.",
     )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=(
+            "Seconds to reuse cached responses for today and future dates. "
+            f"Defaults to {DEFAULT_CACHE_TTL}. Requires requests-cache."
+        ),
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help=(
+            "Fetch days concurrently with asyncio and aiohttp instead of threads. "
+            "Responses are not cached, retried or sent as conditional requests."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Parse responses incrementally with ijson, keeping only Sapsan trains "
+            "in memory. Not available with --async."
+        ),
+    )
     parser.add_argument(
         "--output",
         type=Path,
         default=Path("sapsan_table.html"),
         help="Output HTML file.",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Also write a pre-compressed copy of the output next to it (<output>.gz).",
+    )
+    args = parser.parse_args(argv)
+    if args.use_async and aiohttp is None:
+        parser.error("--async requires the aiohttp package")
+    if args.stream and ijson is None:
+        parser.error("--stream requires the ijson package")
+    if args.stream and args.use_async:
+        parser.error("--stream cannot be combined with --async")
+    return args
+
+
+def fetch_day(
+    date: dt.date,
+    session: Optional[requests.Session] = None,
+    cache_ttl: int = DEFAULT_CACHE_TTL,
+    stream: bool = False,
+) -> Dict[str, FareQuote]:
+    """Fetch timetable info for a single date.
+
+    Returns a mapping from departure time string (HH:MM) to fare quote. With
+    ``stream`` the body is parsed incrementally with ijson instead of being
+    decoded as a whole, unless the response was served by requests-cache.
+    Without ``session`` the shared module session is used.
+    """
+    if session is None:
+        session = _get_session()
+    params = _build_params(date)
+    request_kwargs = {}
+    validated = None
+    use_validators = True
+    if requests_cache is not None and isinstance(session, requests_cache.CachedSession):
+        # The schedule for past dates no longer changes, so keep it forever.
+        # requests-cache revalidates expired entries with ETag/Last-Modified
+        # itself, so the validator store below is only used without it.
+        use_validators = False
+        if date < dt.date.today():
+            request_kwargs["expire_after"] = requests_cache.NEVER_EXPIRE
+        else:
+            request_kwargs["expire_after"] = cache_ttl
+    else:
+        validated = _load_validated(params["dt0"])
+        if validated is not None:
+            request_kwargs["headers"] = _conditional_headers(validated)
+    response = session.get(
+        BASE_URL, params=params, timeout=REQUEST_TIMEOUT, stream=stream, **request_kwargs
+    )
+    with response:
+        response.raise_for_status()
+        if response.status_code == 304 and validated is not None:
+            return validated["departures"]
+        # requests-cache reads the whole body to store it and serves hits from
+        # memory with an empty raw stream, so only stream uncached responses.
+        if stream and not getattr(response, "from_cache", False):
+            # Let urllib3 undo any Content-Encoding before ijson sees the bytes.
+            response.raw.decode_content = True
+            departures = _parse_departures(_iter_streamed_trains(response.raw))
+        else:
+            departures = _parse_departures(_iter_payload_trains(_json_loads(response.content)))
+    if use_validators:
+        _store_validated(params["dt0"], response.headers, departures)
+    return departures
 
 
-def fetch_day(date: dt.date) -> Dict[str, FareQuote]:
-    """Fetch timetable info for a single date.
+async def fetch_day_async(session: "aiohttp.ClientSession", date: dt.date) -> Dict[str, FareQuote]:
+    """Asyncio counterpart of :func:`fetch_day` built on aiohttp."""
+    async with session.get(BASE_URL, params=_build_params(date)) as response:
+        response.raise_for_status()
+        # RZD does not always label the payload as application/json.
+        body = await response.read()
+    return _parse_departures(_iter_payload_trains(_json_loads(body)))
+
 
-    Returns a mapping from departure time string (HH:MM) to fare quote.
+def _load_validated(key: str) -> Optional[Dict]:
+    """Return the stored validators and quotes for ``key``, if any.
+
+    Any entry that cannot be read or rebuilt is treated as missing, so a stale
+    or corrupt store only costs a full request.
     """
-    params = {
+    try:
+        with _VALIDATORS_LOCK, shelve.open(VALIDATORS_NAME) as db:
+            entry = db.get(key)
+        if not entry or entry.get("version") != VALIDATORS_VERSION:
+            return None
+        departures = {
+            dep: FareQuote(departure=dt.datetime.fromisoformat(departure), price=float(price))
+            for dep, (departure, price) in entry["departures"].items()
+        }
+    except Exception:  # unpickling can fail in many ways; never abort the run
+        return None
+    return {
+        "etag": entry.get("etag"),
+        "last_modified": entry.get("last_modified"),
+        "departures": departures,
+    }
+
+
+def _store_validated(key: str, headers: Mapping[str, str], departures: Dict[str, FareQuote]) -> None:
+    """Remember response validators so the next request for ``key`` can be conditional."""
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    with _VALIDATORS_LOCK, shelve.open(VALIDATORS_NAME) as db:
+        if etag or last_modified:
+            # Only plain data is pickled so entries survive changes to FareQuote
+            # and load the same whether the script ran as __main__ or a module.
+            db[key] = {
+                "version": VALIDATORS_VERSION,
+                "etag": etag,
+                "last_modified": last_modified,
+                "departures": {
+                    dep: (quote.departure.isoformat(), quote.price)
+                    for dep, quote in departures.items()
+                },
+            }
+        elif key in db:
+            # The server stopped sending validators; don't revalidate stale data.
+            del db[key]
+
+
+def _conditional_headers(validated: Dict) -> Dict[str, str]:
+    headers = {}
+    if validated.get("etag"):
+        headers["If-None-Match"] = validated["etag"]
+    if validated.get("last_modified"):
+        headers["If-Modified-Since"] = validated["last_modified"]
+    return headers
+
+
+def _build_params(date: dt.date) -> Dict[str, str]:
+    return {
         "layer_id": "5827",
         "dir": "0",
         "tfl": "3",
@@ -78,39 +320,80 @@ def fetch_day(date: dt.date) -> Dict[str, FareQuote]:
         "code1": SAINT_P_CODE,
         "dt0": date.strftime(DATE_FORMAT),
     }
-    response = requests.get(BASE_URL, params=params, timeout=30)
-    response.raise_for_status()
-    payload = response.json()
 
-    departures: Dict[str, FareQuote] = {}
 
+def _iter_payload_trains(payload: Dict) -> Iterator[Tuple[Optional[str], Dict]]:
+    """Yield ``(segment date0, train)`` pairs from a decoded timetable payload."""
     for segment in payload.get("tp", []):
+        segment_date = segment.get("date0")
         for train in segment.get("list", []):
-            number = train.get("number")
-            if not number:
-                continue
-            if int("".join(filter(str.isdigit, number))) <= 700:
-                continue
+            yield segment_date, train
+
 
-            travel_time = train.get("timeInWay") or train.get("timeInWayMin")
-            minutes = _parse_travel_minutes(travel_time)
-            if minutes is None or minutes > MAX_TRAVEL_MINUTES:
-                continue
+def _iter_streamed_trains(stream: IO[bytes]) -> Iterator[Tuple[Optional[str], Dict]]:
+    """Yield ``(segment date0, train)`` pairs while parsing ``stream`` with ijson.
 
-            depart_str = f"{train.get('time0')}"
-            depart_date_str = train.get("date0") or segment.get("date0")
-            if not depart_date_str or not depart_str:
-                continue
+    Only one train object is materialized at a time; non-Sapsan trains are
+    dropped as soon as they are built. Sapsan trains are held until the end of
+    their segment because the segment's ``date0`` may follow its train list.
+    """
+    segment_date: Optional[str] = None
+    pending: List[Dict] = []
+    builder = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == "tp.item.list.item" and event == "end_map":
+                train = builder.value
+                builder = None
+                if _is_sapsan_number(train.get("number")):
+                    pending.append(train)
+        elif prefix == "tp.item.list.item" and event == "start_map":
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == "tp.item.date0" and event == "string":
+            segment_date = value
+        elif prefix == "tp.item" and event == "end_map":
+            for train in pending:
+                yield segment_date, train
+            segment_date = None
+            pending = []
+
+
+def _is_sapsan_number(number: Optional[str]) -> bool:
+    if not number:
+        return False
+    # Train numbers look like "758А"; only the numeric part matters.
+    match = _DIGITS_RE.search(number)
+    return bool(match) and int(match.group()) > SAPSAN_MIN_NUMBER
+
+
+def _parse_departures(trains: Iterable[Tuple[Optional[str], Dict]]) -> Dict[str, FareQuote]:
+    """Extract Sapsan fare quotes from ``(segment date0, train)`` pairs."""
+    departures: Dict[str, FareQuote] = {}
 
-            depart_dt = _combine_date_time(depart_date_str, depart_str)
-            weekday = depart_dt.strftime("%A")
+    for segment_date, train in trains:
+        if not _is_sapsan_number(train.get("number")):
+            continue
 
-            min_price = _extract_min_price(train.get("cars", []))
-            if min_price is None:
-                continue
+        travel_time = train.get("timeInWay") or train.get("timeInWayMin")
+        minutes = _parse_travel_minutes(travel_time)
+        if minutes is None or minutes > MAX_TRAVEL_MINUTES:
+            continue
+
+        depart_str = f"{train.get('time0')}"
+        depart_date_str = train.get("date0") or segment_date
+        if not depart_date_str or not depart_str:
+            continue
+
+        depart_dt = _combine_date_time(depart_date_str, depart_str)
+
+        min_price = _extract_min_price(train.get("cars", []))
+        if min_price is None:
+            continue
 
-            quote = FareQuote(departure=depart_dt, weekday=weekday, price=min_price)
-            departures[depart_str] = quote
+        quote = FareQuote(departure=depart_dt, price=min_price)
+        departures[depart_str] = quote
 
     return departures
 
@@ -118,23 +401,22 @@ def fetch_day(date: dt.date) -> Dict[str, FareQuote]:
 def _parse_travel_minutes(raw: Optional[str]) -> Optional[int]:
     if not raw:
         return None
-    if isinstance(raw, (int, float)):
+    # Exact type checks are cheaper than isinstance on this per-train path.
+    if type(raw) is int:
+        return raw
+    if type(raw) is float:
         return int(raw)
-    raw = str(raw)
-    if ":" in raw:
-        parts = raw.split(":")
-        if len(parts) == 2:
-            hours, minutes = parts
-        elif len(parts) == 3:
-            hours, minutes = parts[0], parts[1]
-        else:
-            return None
+    text = raw if type(raw) is str else str(raw)
+    # Fast path for the usual "HH:MM" (or "HH:MM:SS") shape.
+    hours, sep, rest = text.partition(":")
+    if sep:
+        minutes = rest.partition(":")[0]
         try:
             return int(hours) * 60 + int(minutes)
         except ValueError:
             return None
     try:
-        return int(raw)
+        return int(text)
     except ValueError:
         return None
 
@@ -152,14 +434,10 @@ def _combine_date_time(date_str: str, time_str: str) -> dt.datetime:
 def _extract_min_price(cars: Iterable[Dict]) -> Optional[float]:
     min_price: Optional[float] = None
     for car in cars or []:
-        name_candidates = [
-            str(car.get(key, ""))
-            for key in ("service", "type", "tariffType", "typeLoc", "category")
-        ]
-        normalized = {
-            candidate.strip().lower() for candidate in name_candidates if candidate
-        }
-        if not normalized.intersection(ALLOWED_FARE_NAMES):
+        if not any(
+            str(car.get(key) or "").strip().lower() in ALLOWED_FARE_NAMES
+            for key in _FARE_KEYS
+        ):
             continue
         tariff = car.get("tariff") or car.get("tariffValue") or car.get("tariffFull")
         if tariff is None:
@@ -173,44 +451,15 @@ def _extract_min_price(cars: Iterable[Dict]) -> Optional[float]:
     return min_price
 
 
-def build_table(quotes: Dict[str, Dict[str, FareQuote]]) -> str:
-    """Return HTML table markup with responsive design."""
-    all_departures = sorted(quotes.keys(), key=_time_key)
-    weekday_order = [
-        ("Monday", "Понедельник"),
-        ("Tuesday", "Вторник"),
-        ("Wednesday", "Среда"),
-        ("Thursday", "Четверг"),
-        ("Friday", "Пятница"),
-        ("Saturday", "Суббота"),
-        ("Sunday", "Воскресенье"),
-    ]
-
-    def render_cell(dep: str, key: str, label: str) -> str:
-        quote = quotes.get(dep, {}).get(key)
-        if not quote:
-            return "<td class=\"empty\">—</td>"
-        price_text = f"{int(quote.price):,}".replace(",", " ")
-        return f"<td data-label=\"{label}\">{price_text} ₽</td>"
-
-    rows_html = []
-    for dep in all_departures:
-        cells = [render_cell(dep, key, label) for key, label in weekday_order]
-        rows_html.append(
-            "<tr>"
-            f"<th scope=\"row\" data-label=\"Время отправления\">{dep}</th>"
-            + "".join(cells)
-            + "</tr>"
-        )
-
-    return f"""
+# Static page shell around the table rows; it holds no per-run data.
+_HTML_PREFIX = """
 <!DOCTYPE html>
 <html lang="ru">
 <head>
   <meta charset="utf-8">
   <meta name="viewport" content="width=device-width, initial-scale=1">
   <style>
-    :root {{
+    :root {
       color-scheme: light dark;
       --accent: #e53935;
       --bg: #ffffff;
@@ -218,97 +467,97 @@ def build_table(quotes: Dict[str, Dict[str, FareQuote]]) -> str:
       --text: #1a1a1a;
       --text-dark: #f5f5f5;
       font-family: "Segoe UI", "Roboto", "Helvetica Neue", Arial, sans-serif;
-    }}
-    body {{
+    }
+    body {
       background: var(--bg);
       color: var(--text);
       margin: 0;
       padding: 1rem;
-    }}
-    @media (prefers-color-scheme: dark) {{
-      body {{
+    }
+    @media (prefers-color-scheme: dark) {
+      body {
         background: var(--bg-dark);
         color: var(--text-dark);
-      }}
-      table {{
+      }
+      table {
         background: #1f1f1f;
-      }}
-    }}
-    .table-wrapper {{
+      }
+    }
+    .table-wrapper {
       max-width: 100%;
       overflow-x: auto;
       border-radius: 16px;
       box-shadow: 0 20px 45px rgba(20, 30, 55, 0.12);
       background: rgba(255, 255, 255, 0.9);
       backdrop-filter: blur(12px);
-    }}
-    table {{
+    }
+    table {
       width: 100%;
       border-collapse: collapse;
       min-width: 720px;
-    }}
-    caption {{
+    }
+    caption {
       text-align: left;
       padding: 1rem;
       font-size: 1.3rem;
       font-weight: 600;
       color: var(--accent);
-    }}
+    }
     th,
-    td {{
+    td {
       padding: 0.9rem 1rem;
       border-bottom: 1px solid rgba(0, 0, 0, 0.08);
       text-align: left;
       font-size: 0.95rem;
-    }}
-    th {{
+    }
+    th {
       font-weight: 600;
       background: rgba(229, 57, 53, 0.08);
-    }}
-    tbody tr:hover {{
+    }
+    tbody tr:hover {
       background: rgba(229, 57, 53, 0.12);
       transition: background 0.3s ease;
-    }}
-    .empty {{
+    }
+    .empty {
       color: rgba(0, 0, 0, 0.45);
       font-style: italic;
-    }}
-    @media (max-width: 768px) {{
-      table {{
+    }
+    @media (max-width: 768px) {
+      table {
         min-width: unset;
         border-collapse: separate;
         border-spacing: 0;
-      }}
-      thead {{
+      }
+      thead {
         display: none;
-      }}
-      tbody tr {{
+      }
+      tbody tr {
         display: grid;
         grid-template-columns: repeat(2, minmax(0, 1fr));
         gap: 0.5rem;
         padding: 1rem;
         border-bottom: 1px solid rgba(0, 0, 0, 0.12);
-      }}
-      tbody tr th {{
+      }
+      tbody tr th {
         display: block;
         background: none;
         padding: 0;
         font-size: 1.1rem;
         color: var(--accent);
-      }}
-      tbody tr td {{
+      }
+      tbody tr td {
         display: flex;
         justify-content: space-between;
         align-items: center;
         padding: 0.35rem 0;
         border: none;
-      }}
-      tbody tr td::before {{
+      }
+      tbody tr td::before {
         content: attr(data-label);
         font-weight: 600;
         margin-right: 0.75rem;
-      }}
-    }}
+      }
+    }
   </style>
 </head>
 <body>
@@ -328,13 +577,47 @@ def build_table(quotes: Dict[str, Dict[str, FareQuote]]) -> str:
         </tr>
       </thead>
       <tbody>
-        {''.join(rows_html)}
+        """
+_HTML_SUFFIX = """
       </tbody>
     </table>
   </div>
 </body>
 </html>
 """
+# Prices are grouped by thousands with a space, e.g. "12 345".
+_THOUSANDS_TRANS = str.maketrans({",": " "})
+_WEEKDAY_ORDER = tuple(zip(_WEEKDAYS_EN, (
+    "Понедельник",
+    "Вторник",
+    "Среда",
+    "Четверг",
+    "Пятница",
+    "Суббота",
+    "Воскресенье",
+)))
+
+
+def build_table(quotes: Dict[str, Dict[str, FareQuote]]) -> str:
+    """Return HTML table markup with responsive design."""
+    all_departures = sorted(quotes.keys(), key=_time_key)
+
+    rows_html = []
+    for dep in all_departures:
+        inner = quotes[dep]
+        cells = []
+        for key, label in _WEEKDAY_ORDER:
+            quote = inner.get(key)
+            if quote is None:
+                cells.append("<td class=\"empty\">—</td>")
+            else:
+                price_text = format(int(quote.price), ",d").translate(_THOUSANDS_TRANS)
+                cells.append(f"<td data-label=\"{label}\">{price_text} ₽</td>")
+        rows_html.append(
+            f"<tr><th scope=\"row\" data-label=\"Время отправления\">{dep}</th>{''.join(cells)}</tr>"
+        )
+
+    return _HTML_PREFIX + "".join(rows_html) + _HTML_SUFFIX
 
 
 def _time_key(time_str: str) -> tuple:
@@ -343,6 +626,7 @@ def _time_key(time_str: str) -> tuple:
 
 
 def consolidate_quotes(quotes_by_day: Dict[str, Dict[str, FareQuote]]) -> Dict[str, Dict[str, FareQuote]]:
+    """Pivot weekday -> departure quotes into departure -> weekday in one pass."""
     aggregated: Dict[str, Dict[str, FareQuote]] = defaultdict(dict)
     for weekday, departures in quotes_by_day.items():
         for dep_time, quote in departures.items():
@@ -352,30 +636,67 @@ def consolidate_quotes(quotes_by_day: Dict[str, Dict[str, FareQuote]]) -> Dict[s
     return aggregated
 
 
+def _fetch_threaded(
+    dates: List[dt.date], cache_ttl: int, stream: bool = False
+) -> Dict[dt.date, Dict[str, FareQuote]]:
+    fetched: Dict[dt.date, Dict[str, FareQuote]] = {}
+    if not dates:
+        return fetched
+    session = _get_session()
+    with ThreadPoolExecutor(max_workers=min(len(dates), MAX_WORKERS)) as executor:
+        futures = {executor.submit(fetch_day, date, session, cache_ttl, stream): date for date in dates}
+        for future in as_completed(futures):
+            current_date = futures[future]
+            try:
+                fetched[current_date] = future.result()
+            except requests.HTTPError as exc:
+                print(f"Failed to fetch data for {current_date:%d.%m.%Y}: {exc}", file=sys.stderr)
+    return fetched
+
+
+async def _fetch_async(dates: List[dt.date]) -> Dict[dt.date, Dict[str, FareQuote]]:
+    fetched: Dict[dt.date, Dict[str, FareQuote]] = {}
+    connector = aiohttp.TCPConnector(limit=MAX_ASYNC_CONNECTIONS)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = await asyncio.gather(
+            *(fetch_day_async(session, date) for date in dates),
+            return_exceptions=True,
+        )
+    for current_date, result in zip(dates, results):
+        if isinstance(result, aiohttp.ClientError):
+            print(f"Failed to fetch data for {current_date:%d.%m.%Y}: {result}", file=sys.stderr)
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        fetched[current_date] = result
+    return fetched
+
+
 def main(argv: Optional[Iterable[str]] = None) -> int:
     args = parse_args(argv)
-    quotes_by_day: Dict[str, Dict[str, FareQuote]] = {}
+    dates = [args.start_date + dt.timedelta(days=offset) for offset in range(args.days)]
+    if args.use_async:
+        fetched = asyncio.run(_fetch_async(dates))
+    else:
+        fetched = _fetch_threaded(dates, args.cache_ttl, args.stream)
 
-    for offset in range(args.days):
-        current_date = args.start_date + dt.timedelta(days=offset)
-        try:
-            departures = fetch_day(current_date)
-        except requests.HTTPError as exc:
-            print(f"Failed to fetch data for {current_date:%d.%m.%Y}: {exc}", file=sys.stderr)
-            continue
-        quotes_by_day[current_date.strftime("%A")] = departures
+    # Walk the dates in order so later days win on weekday collisions, as before.
+    quotes_by_day: Dict[str, Dict[str, FareQuote]] = {}
+    for current_date in dates:
+        if current_date in fetched:
+            quotes_by_day[_WEEKDAYS_EN[current_date.weekday()]] = fetched[current_date]
 
-    consolidated = consolidate_quotes({
-        weekday: {
-            dep: dataclasses.replace(quote, weekday=weekday)
-            for dep, quote in departures.items()
-        }
-        for weekday, departures in quotes_by_day.items()
-    })
+    consolidated = consolidate_quotes(quotes_by_day)
 
     html = build_table(consolidated)
     args.output.write_text(html, encoding="utf-8")
     print(f"Saved table to {args.output.resolve()}")
+    if args.gzip:
+        gz_path = args.output.with_suffix(args.output.suffix + ".gz")
+        with gzip.open(gz_path, "wb", compresslevel=6) as fh:
+            fh.write(html.encode("utf-8"))
+        print(f"Saved compressed table to {gz_path.resolve()}")
     return 0
 
 